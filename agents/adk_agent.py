@@ -1,6 +1,10 @@
+import asyncio
 import logging
-from core.google_adk_manager import GoogleADKManager
-import time
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core.google_adk_manager import GoogleADKManager
 
 class ADKAgent:
     """Agent for handling Google ADK (Accessory Development Kit) operations."""
@@ -8,20 +12,37 @@ class ADKAgent:
     # Class-level variable to maintain connection state
     _instance = None
     _is_connected = False
+    _lock = threading.Lock()
     
     def __new__(cls):
         """Ensure only one instance of ADKAgent exists."""
+        # Double-checked locking: the lock is only taken until the instance exists
         if cls._instance is None:
-            cls._instance = super(ADKAgent, cls).__new__(cls)
-            cls._instance.adk_manager = GoogleADKManager()
-            cls._instance.device = None
-            cls._instance.setup_logging()
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super(ADKAgent, cls).__new__(cls)
+                    instance._adk_manager = None
+                    instance.device = None
+                    instance.setup_logging()
+                    # Publish only once fully initialized so the unlocked check never sees a partial instance
+                    cls._instance = instance
         return cls._instance
     
     def setup_logging(self):
         """Configure logging for the ADK agent."""
         self.logger = logging.getLogger('ADKAgent')
         
+    @property
+    def adk_manager(self) -> "GoogleADKManager":
+        """The USB manager, created on first use so goals that never touch a device skip USB setup."""
+        if self._adk_manager is None:
+            with self._lock:
+                if self._adk_manager is None:
+                    # Imported here so pyusb is only loaded once a device action needs it
+                    from core.google_adk_manager import GoogleADKManager
+                    self._adk_manager = GoogleADKManager()
+        return self._adk_manager
+        
     def connect_device(self) -> bool:
         """
         Connect to the Android device.
@@ -52,20 +73,68 @@ class ADKAgent:
             self.logger.error(f"Error connecting to device: {str(e)}")
             return False
             
-    def run(self, input_data=None) -> dict:
+    async def _run_blocking(self, func, *args):
+        """Run a blocking USB call on the manager's USB thread so the event loop stays responsive."""
+        return await self.adk_manager.run_in_usb_thread(func, *args)
+            
+    async def run(self, input_data=None) -> dict:
         """
         Run the ADK agent.
         
         Args:
-            input_data: Optional input data for the agent
+            input_data: Optional input data for the agent. A {"batch": [...]} input
+                runs several actions in one call, in order.
+            
+        Returns:
+            dict: Result of the operation. For a batch, "results" holds the result
+            of each action that ran.
+        """
+        if isinstance(input_data, dict) and "batch" in input_data:
+            return await self.run_batch(input_data["batch"])
+        return await self.run_action(input_data)
+        
+    async def run_batch(self, actions) -> dict:
+        """
+        Run several actions in order, stopping at the first one that does not succeed
+        so the caller can decide how to recover (e.g. retry a receive before closing).
+        
+        Args:
+            actions: List of action inputs, as accepted by run_action()
+            
+        Returns:
+            dict: Status of the last action that ran and the ordered per-action results
+        """
+        if not actions:
+            return {"status": "error", "message": "Empty batch", "results": []}
+            
+        results = []
+        for action_data in actions:
+            result = await self.run_action(action_data)
+            results.append(result)
+            if result.get("status") != "success":
+                break
+                
+        return {
+            "status": results[-1]["status"],
+            "message": results[-1].get("message"),
+            "results": results
+        }
+            
+    async def run_action(self, input_data=None) -> dict:
+        """
+        Run a single ADK action.
+        
+        Args:
+            input_data: None or {"action": "connect"} to connect, otherwise a dict with
+                an "action" of "send" (with "data"), "receive" or "close"
             
         Returns:
             dict: Result of the operation
         """
         try:
             # If no input data, try to connect to device
-            if input_data is None:
-                if self.connect_device():
+            if input_data is None or (isinstance(input_data, dict) and input_data.get("action") == "connect"):
+                if await self._run_blocking(self.connect_device):
                     return {"status": "success", "message": "Connected to device"}
                 else:
                     return {"status": "error", "message": "Failed to connect to device"}
@@ -84,19 +153,19 @@ class ADKAgent:
                         return {"status": "error", "message": "No data provided to send"}
                         
                     self.logger.info(f"Attempting to send data: {data}")
-                    if self.adk_manager.send_data(data.encode()):
-                        # Wait a short time for the device to process
-                        time.sleep(0.5)
+                    if await self.adk_manager.send_data_async(data.encode()):
+                        # Wait a short time for the device to process without blocking other agents
+                        await asyncio.sleep(0.5)
                         
                         # Try to receive response
                         self.logger.info("Waiting for response...")
-                        response = self.adk_manager.receive_data()
+                        response = await self.adk_manager.receive_data_async()
                         if response:
                             return {
                                 "status": "success", 
                                 "message": "Data sent and response received",
                                 "sent_data": data,
-                                "received_data": response.decode()
+                                "received_data": str(response, "utf-8")
                             }
                         else:
                             return {
@@ -109,12 +178,12 @@ class ADKAgent:
                         
                 elif action == "receive":
                     self.logger.info("Attempting to receive data...")
-                    data = self.adk_manager.receive_data()
+                    data = await self.adk_manager.receive_data_async()
                     if data:
                         return {
                             "status": "success", 
                             "message": "Data received successfully",
-                            "data": data.decode()
+                            "data": str(data, "utf-8")
                         }
                     else:
                         return {
@@ -123,7 +192,7 @@ class ADKAgent:
                         }
                         
                 elif action == "close":
-                    self.adk_manager.close()
+                    await self._run_blocking(self.adk_manager.close)
                     self._is_connected = False
                     return {"status": "success", "message": "Connection closed"}
                     
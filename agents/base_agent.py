@@ -20,9 +20,12 @@ class BaseAgent(ABC):
         self.name = name
     
     @abstractmethod
-    def run(self, input_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    async def run(self, input_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Execute the agent's main logic.
         
+        Agents are coroutines so that independent I/O-bound agents can be
+        awaited concurrently by the AgentManager.
+        
         Args:
             input_data (Optional[Dict[str, Any]]): Input data for the agent to process
             
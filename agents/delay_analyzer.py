@@ -1,12 +1,15 @@
 from agents.base_agent import BaseAgent
 
 class DelayAnalyzerAgent(BaseAgent):
+    # Weather conditions (OpenWeather "main" values) likely to delay a launch
+    _DELAY_CONDITIONS = frozenset({"Rain", "Storm", "Snow", "Thunderstorm", "Tornado"})
+
     def __init__(self):
         super().__init__("DelayAnalyzerAgent")
 
-    def run(self, input_data):
-        weather = input_data.get("weather", {})
-        condition = weather.get("weather", [{}])[0].get("main", "")
-        delay_possible = condition in ["Rain", "Storm", "Snow"]
-        input_data["delay_analysis"] = f"Delay likely: {delay_possible} based on condition: {condition}"
-        return input_data
+    async def run(self, input_data):
+        input_data = input_data or {}
+        condition = input_data.get("weather", {}).get("weather", ({},))[0].get("main", "")
+        delay_possible = condition in self._DELAY_CONDITIONS
+        # Return a new dict so the caller's data is never mutated; formatting is left to the caller
+        return {**input_data, "delay_analysis": (delay_possible, condition)}
@@ -0,0 +1,106 @@
+import asyncio
+import functools
+import time
+import weakref
+import aiohttp
+from agents.base_agent import BaseAgent
+
+# orjson decodes the API payloads several times faster than the standard library
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    import json
+    json_loads = json.loads
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Whether a failed HTTP fetch is worth retrying.
+
+    Network failures, timeouts and 5xx responses are usually transient. 4xx
+    responses (e.g. a bad API key) will fail the same way on every attempt.
+    """
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status >= 500
+    return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+class HttpAgent(BaseAgent):
+    """Base class for agents that fetch JSON from public HTTP APIs.
+
+    All HTTP agents share one aiohttp.ClientSession per event loop, so the
+    keep-alive connections (and their TLS sessions) opened by one agent are
+    reused by the next one instead of being re-established on every run.
+
+    Decoded responses are cached in memory for CACHE_TTL seconds, keyed by URL,
+    since the upstream data changes far more slowly than agents are invoked.
+    Concurrent fetches of the same URL share a single request.
+    """
+
+    # Explicit timeouts (in seconds) so a stalled API can't hang the whole pipeline
+    REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10, sock_connect=3.05)
+
+    # Seconds a decoded response stays fresh; 0 disables caching
+    CACHE_TTL = 0
+
+    # URL -> (time.monotonic() timestamp, decoded JSON), shared by all HTTP agents
+    _cache = {}
+
+    # Event loop -> shared session; sessions can't be used across event loops
+    _sessions = weakref.WeakKeyDictionary()
+
+    # Event loop -> {URL: task fetching it}, so concurrent callers await one request
+    _inflight = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def get_session(cls) -> aiohttp.ClientSession:
+        """Return the session bound to the running event loop, creating it if needed."""
+        loop = asyncio.get_running_loop()
+        session = HttpAgent._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(limit=10, limit_per_host=4, ttl_dns_cache=300)
+            session = aiohttp.ClientSession(connector=connector, timeout=cls.REQUEST_TIMEOUT)
+            HttpAgent._sessions[loop] = session
+        return session
+
+    @classmethod
+    async def close_sessions(cls) -> None:
+        """Close the session bound to the running event loop, if any."""
+        session = HttpAgent._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+
+    async def fetch_json(self, url: str):
+        """GET the given URL over the shared session and decode the JSON body.
+
+        Cached results are shared between callers and must not be mutated.
+        """
+        cached = HttpAgent._cache.get(url)
+        if cached is not None and time.monotonic() - cached[0] < self.CACHE_TTL:
+            return cached[1]
+
+        inflight = HttpAgent._inflight.setdefault(asyncio.get_running_loop(), {})
+        task = inflight.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(url))
+            inflight[url] = task
+            task.add_done_callback(functools.partial(self._fetch_done, inflight, url))
+        # Shielded so that cancelling one caller does not cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def _fetch(self, url: str):
+        """Perform the GET for fetch_json() and cache the decoded body."""
+        async with self.get_session().get(url) as response:
+            response.raise_for_status()
+            data = json_loads(await response.read())
+
+        if self.CACHE_TTL > 0:
+            HttpAgent._cache[url] = (time.monotonic(), data)
+        return data
+
+    @staticmethod
+    def _fetch_done(inflight: dict, url: str, task: asyncio.Future) -> None:
+        """Forget a finished fetch so the next caller starts a new one."""
+        inflight.pop(url, None)
+        if not task.cancelled():
+            # Retrieve the error even if every caller was cancelled, to avoid an
+            # "exception was never retrieved" warning
+            task.exception()
@@ -1,6 +1,7 @@
 from typing import List, Dict, Any
 from agents.base_agent import BaseAgent
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
@@ -14,11 +15,19 @@ class PlannerAgent(BaseAgent):
         name (str): The name of the agent (PlannerAgent)
     """
     
+    # All routing keywords, matched in a single pass. Only the start of a word is
+    # anchored so that inflections such as "delayed" or "devices" still match.
+    _KEYWORD_RE = re.compile(
+        r"\b(connect|device|send|data|receive|spacex|delay|weather)", re.IGNORECASE
+    )
+    _ADK_KEYWORDS = frozenset({"connect", "device", "send", "receive", "data"})
+    _PUNCTUATION_RE = re.compile(r"[^\w\s]")
+    
     def __init__(self) -> None:
         """Initialize the planner agent."""
         super().__init__(name="PlannerAgent")
     
-    def run(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def run(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute the planner agent's logic.
         
         Args:
@@ -36,6 +45,21 @@ class PlannerAgent(BaseAgent):
         tasks = self.plan(input_data['goal'])
         return {"tasks": tasks}
     
+    @classmethod
+    def normalize_goal(cls, goal: str) -> str:
+        """Lowercase a goal, replace punctuation with spaces and collapse whitespace.
+        
+        Goals with the same normalized form always get the same plan, since
+        plan() matches keywords against this form.
+        
+        Args:
+            goal (str): The user's goal
+            
+        Returns:
+            str: The normalized goal
+        """
+        return " ".join(cls._PUNCTUATION_RE.sub(" ", goal.lower()).split())
+    
     def plan(self, goal: str) -> List[str]:
         """Parse the user goal and determine the required agent execution order.
         
@@ -48,36 +72,32 @@ class PlannerAgent(BaseAgent):
         Note:
             The planner recognizes several keywords to determine which agents to include:
             - ADK-related: "connect", "device", "send", "receive", "data"
-            - SpaceX-related: "SpaceX"
+            - SpaceX-related: "SpaceX" (case-insensitive)
             - Weather-related: "weather", "delay"
         """
-        if not goal:
+        if not goal or goal.isspace():
             logger.warning("Empty goal provided to planner")
             return []
             
         tasks = []
-        goal_lower = goal.lower()
+        tokens = set(self._KEYWORD_RE.findall(self.normalize_goal(goal)))
         
         # Check for ADK-related tasks
-        if any(word in goal_lower for word in ["connect", "device"]):
-            tasks.append("ADKAgent")
-            
-        if any(word in goal_lower for word in ["send", "data"]):
-            tasks.append("ADKAgent")
-            
-        if any(word in goal_lower for word in ["receive", "data"]):
+        if tokens & self._ADK_KEYWORDS:
             tasks.append("ADKAgent")
 
         # Check for SpaceX-related tasks
-        if "SpaceX" in goal:
+        if "spacex" in tokens:
             tasks.append("SpaceXAgent")
 
         # Check for weather and delay analysis tasks
-        if "delay" in goal_lower:
+        if "delay" in tokens:
             tasks.append("WeatherAgent")
             tasks.append("DelayAnalyzerAgent")
-        elif "weather" in goal_lower:
+        elif "weather" in tokens:
             tasks.append("WeatherAgent")
 
+        # Each agent runs at most once per plan; dict.fromkeys keeps the first occurrence's order
+        tasks = list(dict.fromkeys(tasks))
         logger.info(f"Planned tasks for goal '{goal}': {tasks}")
         return tasks
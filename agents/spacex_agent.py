@@ -1,14 +1,15 @@
-from agents.base_agent import BaseAgent
-import requests
+from agents.http_agent import HttpAgent
+
+class SpaceXAgent(HttpAgent):
+    # The next-launch payload changes on the order of hours
+    CACHE_TTL = 120
 
-class SpaceXAgent(BaseAgent):
     def __init__(self):
         super().__init__("SpaceXAgent")
 
-    def run(self, input_data):
+    async def run(self, input_data):
         # Fetch next SpaceX launch info
-        response = requests.get("https://api.spacexdata.com/v4/launches/next")
-        data = response.json()
+        data = await self.fetch_json("https://api.spacexdata.com/v4/launches/next")
         return {
             "name": data["name"],
             "launchpad": data["launchpad"],
@@ -1,19 +1,28 @@
-from agents.base_agent import BaseAgent
-import requests
+from agents.http_agent import HttpAgent
+import functools
 import os
 from dotenv import load_dotenv
-load_dotenv()
 
-class WeatherAgent(BaseAgent):
+@functools.lru_cache(maxsize=None)
+def _load_env():
+    """Read the .env file once, the first time a WeatherAgent is created."""
+    load_dotenv()
+
+class WeatherAgent(HttpAgent):
+    # Weather changes faster than launch data, so keep it for a shorter time
+    CACHE_TTL = 60
+
+    # Here we fake the location for simplicity
+    LAT, LON = 28.5623, -80.5774  # Kennedy Space Center
+
     def __init__(self):
         super().__init__("WeatherAgent")
+        _load_env()
         self.api_key = os.getenv("OPENWEATHER_API_KEY")
+        # The query never changes for an instance, so build the URL once
+        self._url = f"https://api.openweathermap.org/data/2.5/weather?lat={self.LAT}&lon={self.LON}&appid={self.api_key}&units=metric"
 
-    def run(self, input_data):
-        # Here we fake the location for simplicity
-        lat, lon = 28.5623, -80.5774  # Kennedy Space Center
-        url = f"https://api.openweathermap.org/data/2.5/weather?lat={lat}&lon={lon}&appid={self.api_key}&units=metric"
-        response = requests.get(url)
-        data = response.json()
-        input_data["weather"] = data
-        return input_data
+    async def run(self, input_data):
+        data = await self.fetch_json(self._url)
+        # Only return the new key; the AgentManager merges it into the shared data
+        return {"weather": data}
@@ -1,49 +1,175 @@
+import asyncio
+import logging
+
+from tenacity import (
+    AsyncRetrying,
+    RetryError,
+    retry_if_exception,
+    retry_if_result,
+    stop_after_attempt,
+    wait_exponential,
+)
+
+from agents.http_agent import HttpAgent, is_retryable_error
 from agents.spacex_agent import SpaceXAgent
 from agents.weather_agent import WeatherAgent
 from agents.delay_analyzer import DelayAnalyzerAgent
 from agents.adk_agent import ADKAgent
 from agents.planner_agent import PlannerAgent
 
+logger = logging.getLogger(__name__)
+
 class AgentManager:
     """Manages the execution of agents and their interactions."""
-    
+
+    # Agents whose inputs are known: each one only waits for the listed agents
+    # (when they are part of the plan). Any other agent, such as ADKAgent, talks
+    # to a device and waits for every step planned before it.
+    DEPENDENCIES = {
+        "SpaceXAgent": set(),
+        "WeatherAgent": set(),
+        "DelayAnalyzerAgent": {"WeatherAgent"},
+    }
+
+    _AGENT_REGISTRY = {
+        "SpaceXAgent": SpaceXAgent,
+        "WeatherAgent": WeatherAgent,
+        "DelayAnalyzerAgent": DelayAnalyzerAgent,
+        "PlannerAgent": PlannerAgent,
+        "ADKAgent": ADKAgent
+    }
+
+    # Agents that keep no per-run state, so one instance is shared by all runs
+    _STATELESS_AGENTS = {"DelayAnalyzerAgent", "PlannerAgent"}
+    _instance_cache = {}
+
     def __init__(self, task_plan):
         """Initialize the agent manager with a task plan."""
         self.task_plan = task_plan
         self.shared_data = {}
-        
+
+    def set_plan(self, task_plan):
+        """Switch to a new task plan, so one manager can run several plans in turn.
+
+        Shared data from the previous run is cleared when the next run starts.
+        """
+        self.task_plan = task_plan
+
+    def reset(self):
+        """Clear the data shared between agents during the previous run."""
+        self.shared_data = {}
+
     def get_agent_instance(self, agent_name):
         """Get an instance of the specified agent."""
-        agents = {
-            "PlannerAgent": PlannerAgent,
-            "ADKAgent": ADKAgent
-        }
-        
-        if agent_name not in agents:
-            raise ValueError(f"Unknown agent: {agent_name}")
-            
-        return agents[agent_name]()
-        
+        agent = self._instance_cache.get(agent_name)
+        if agent is not None:
+            return agent
+
+        try:
+            agent_class = self._AGENT_REGISTRY[agent_name]
+        except KeyError:
+            raise ValueError(f"Unknown agent: {agent_name}") from None
+
+        agent = agent_class()
+
+        if agent_name in self._STATELESS_AGENTS:
+            self._instance_cache[agent_name] = agent
+        return agent
+
+    def build_dependencies(self):
+        """Map each step of the task plan to the earlier steps it has to wait for."""
+        dependencies = []
+        for index, agent_name in enumerate(self.task_plan):
+            if agent_name in self.DEPENDENCIES:
+                required = self.DEPENDENCIES[agent_name]
+                dependencies.append({i for i in range(index) if self.task_plan[i] in required})
+            else:
+                dependencies.append(set(range(index)))
+        return dependencies
+
     def execute(self, input_data=None):
-        """Execute the current task plan."""
-        for agent_name in self.task_plan:
-            agent = self.get_agent_instance(agent_name)
-            max_attempts = 3
-            attempt = 1
-            
-            while attempt <= max_attempts:
-                try:
-                    print(f"[{agent_name}] Attempt {attempt} with input: {input_data}")
-                    output = agent.run(input_data)
-                    
-                    if output:
-                        return output
-                        
-                except Exception as e:
-                    print(f"Error executing {agent_name}: {str(e)}")
-                    if attempt == max_attempts:
-                        return {"status": "error", "message": str(e)}
-                        
-                attempt += 1
-                
-        return {"status": "error", "message": "No output from any agent"}
+        """Execute the current task plan from synchronous code.
+
+        Thin wrapper around aexecute() that runs it on a fresh event loop.
+        """
+        async def run_plan():
+            try:
+                return await self.aexecute(input_data)
+            finally:
+                await self.aclose()
+
+        return asyncio.run(run_plan())
+
+    @staticmethod
+    async def aclose():
+        """Release the HTTP session bound to the running event loop.
+
+        Callers awaiting aexecute() should call this before their event loop is discarded.
+        """
+        await HttpAgent.close_sessions()
+
+    async def aexecute(self, input_data=None):
+        """Run the plan as a dependency graph, starting each agent as soon as its
+        dependencies have finished and merging outputs into the shared data."""
+        self.reset()
+        waiting = dict(enumerate(self.build_dependencies()))
+        finished = set()
+        running = {}
+
+        def start_ready_agents():
+            for index, dependencies in list(waiting.items()):
+                if dependencies <= finished:
+                    del waiting[index]
+                    agent_name = self.task_plan[index]
+                    agent = self.get_agent_instance(agent_name)
+                    agent_input = {**(input_data or {}), **self.shared_data} or None
+                    task = asyncio.create_task(self._run_agent(agent_name, agent, agent_input))
+                    running[task] = index
+
+        start_ready_agents()
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                output = task.result()
+                if output.get("status") == "error":
+                    for pending in running:
+                        pending.cancel()
+                    await asyncio.gather(*running, return_exceptions=True)
+                    return output
+                self.shared_data.update(output)
+                finished.add(running.pop(task))
+            start_ready_agents()
+
+        if not self.shared_data:
+            return {"status": "error", "message": "No output from any agent"}
+        return self.shared_data
+
+    async def _run_agent(self, agent_name, agent, input_data):
+        """Run a single agent, retrying with exponential backoff on transient
+        failures or empty output. Permanent errors (e.g. HTTP 4xx) fail fast."""
+        retrying = AsyncRetrying(
+            stop=stop_after_attempt(3),
+            wait=wait_exponential(multiplier=0.2, max=2.0),
+            retry=retry_if_exception(is_retryable_error) | retry_if_result(lambda output: not output),
+            reraise=True,
+        )
+
+        try:
+            async for attempt in retrying:
+                with attempt:
+                    attempt_number = attempt.retry_state.attempt_number
+                    logger.info(f"[{agent_name}] Attempt {attempt_number} with input: {input_data}")
+                    try:
+                        output = await agent.run(input_data)
+                    except Exception as e:
+                        logger.error(f"Error executing {agent_name}: {str(e)}")
+                        raise
+                if not attempt.retry_state.outcome.failed:
+                    attempt.retry_state.set_result(output)
+        except RetryError:
+            # Every attempt returned an empty output
+            return {}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+        return output
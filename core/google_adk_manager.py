@@ -1,7 +1,12 @@
+import array
+import asyncio
+import concurrent.futures
+import usb.backend.libusb0
+import usb.backend.libusb1
 import usb.core
 import usb.util
 import time
-from typing import Optional, Dict, List, Tuple, Any
+from typing import Optional, Dict, List, Tuple, Any, Union
 import logging
 import sys
 
@@ -26,6 +31,18 @@ class GoogleADKManager:
     ADK_INTERFACE_SUBCLASS = 0xFF # Vendor Specific
     ADK_INTERFACE_PROTOCOL = 0x00 # Vendor Specific, though some devices might use 0x01 or 0x02
 
+    # Bulk reads only reach full throughput when they span many packets, so
+    # reads are at least this large (in bytes) or 32 max-size packets
+    MIN_TRANSFER_SIZE = 16384
+
+    # Enumerating the USB bus is slow, so a scan is reused for this many seconds
+    _ENUM_TTL = 3.0
+    _enum_cache: Optional[List[usb.core.Device]] = None
+    _enum_ts = 0.0
+
+    # Set once a USB backend has been found; later instances skip the check
+    _backend_checked = False
+
     def __init__(self):
         """Initialize the Google ADK Manager."""
         self.device = None
@@ -36,13 +53,14 @@ class GoogleADKManager:
         self.setup_logging()
         self._check_usb_backend()
         self.operation_timeout = 5000  # 5 seconds timeout for USB operations (in milliseconds)
+        self.read_chunk = self.MIN_TRANSFER_SIZE
+        self._rx_buffer = None # Preallocated bulk read buffer, sized once the IN endpoint is known
+        # A single worker keeps all async USB I/O on one thread, in submission order
+        self._usb_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="usb")
 
     def setup_logging(self):
         """Configure logging for the ADK manager."""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
+        # Handlers and levels are configured once by the application entry point
         self.logger = logging.getLogger('GoogleADKManager')
 
     def _check_usb_backend(self):
@@ -50,11 +68,13 @@ class GoogleADKManager:
         Check if a USB backend is available and provide helpful error messages.
         This function is crucial for ensuring libusb is correctly installed.
         """
+        if GoogleADKManager._backend_checked:
+            return
+
         try:
-            # Try to find any USB device to test backend presence
-            test_dev = usb.core.find(find_all=True)
-            if not list(test_dev): # Ensure the generator is consumed to trigger backend check
-                self.logger.warning("No USB devices found by pyusb backend. This might be normal if no devices are connected.")
+            # Only load the backend libraries; enumerating the bus is left to find_android_device
+            if usb.backend.libusb1.get_backend() is None and usb.backend.libusb0.get_backend() is None:
+                raise usb.core.NoBackendError("No backend available")
         except usb.core.NoBackendError:
             self.logger.error("No USB backend available. Please install libusb (e.g., via Zadig on Windows):")
             self.logger.error("1. Download Zadig from https://zadig.akeo.ie/")
@@ -62,6 +82,22 @@ class GoogleADKManager:
             self.logger.error("3. Install the driver.")
             raise RuntimeError("No USB backend available. Please install libusb driver using Zadig.")
 
+        GoogleADKManager._backend_checked = True
+
+    @classmethod
+    def _list_devices(cls) -> List[usb.core.Device]:
+        """
+        List the devices on the USB bus, reusing the previous scan for _ENUM_TTL seconds.
+        
+        Returns:
+            List[usb.core.Device]: All devices found on the bus.
+        """
+        now = time.monotonic()
+        if cls._enum_cache is None or now - cls._enum_ts >= cls._ENUM_TTL:
+            GoogleADKManager._enum_cache = list(usb.core.find(find_all=True))
+            GoogleADKManager._enum_ts = now
+        return cls._enum_cache
+
     def find_android_device(self) -> Optional[usb.core.Device]:
         """
         Find a connected Android device that matches the specified Vendor IDs.
@@ -71,9 +107,10 @@ class GoogleADKManager:
         """
         try:
             self.logger.info("Scanning for USB devices...")
-            devices = usb.core.find(find_all=True)
+            # Enumerate once; iterating a find() generator after emptiness-checking it would yield nothing
+            devices = self._list_devices()
             
-            if not list(devices): # Consume generator to check if empty
+            if not devices:
                 self.logger.warning("No USB devices found at all. Please check your USB connection.")
                 self.logger.warning("\nPlease ensure:")
                 self.logger.warning("1. Device is connected via USB.")
@@ -170,6 +207,10 @@ class GoogleADKManager:
                 self.logger.error("Expected Interface Class: 0xFF, SubClass: 0xFF, Protocol: 0x00")
                 return False
 
+            # Size reads as a multiple of the IN endpoint's max packet size
+            self.read_chunk = max(self.MIN_TRANSFER_SIZE, 32 * self.endpoint_in.wMaxPacketSize)
+            self._rx_buffer = array.array('B', bytes(self.read_chunk))
+
             # Claim the interface
             self.connection = self.device.open()
             if self.connection:
@@ -193,12 +234,13 @@ class GoogleADKManager:
             self.close() # Clean up any opened resources
             return False
 
-    def send_data(self, data: bytes) -> bool:
+    def send_data(self, data: Union[bytes, bytearray, memoryview]) -> bool:
         """
         Send data to the Android device via USB bulk transfer.
         
         Args:
-            data: Data to send (bytes).
+            data: Data to send. Any bytes-like object is accepted, so callers can
+                pass memoryview slices of a larger buffer without copying them first.
             
         Returns:
             bool: True if send was successful, False otherwise.
@@ -208,7 +250,8 @@ class GoogleADKManager:
             return False
         
         try:
-            self.logger.info(f"Sending {len(data)} bytes via USB: {data[:20]}...") # Log first 20 bytes
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Sending %d bytes via USB: %r...", len(data), bytes(data[:20])) # Log first 20 bytes
             bytes_sent = self.connection.bulkWrite(
                 self.endpoint_out.bEndpointAddress,
                 data,
@@ -218,53 +261,104 @@ class GoogleADKManager:
                 self.logger.info("Data sent successfully.")
                 return True
             else:
-                self.logger.warning(f"Sent {bytes_sent} bytes, expected {len(data)}.")
+                self.logger.warning("Sent %d bytes, expected %d.", bytes_sent, len(data))
                 return False
         except usb.core.USBError as e:
-            self.logger.error(f"USB error during data send: {e}")
+            self.logger.error("USB error during data send: %s", e)
             if "timeout" in str(e).lower():
                 self.logger.error("Send operation timed out. Device might not be responding.")
             return False
         except Exception as e:
-            self.logger.error(f"Unexpected error during data send: {e}")
+            self.logger.error("Unexpected error during data send: %s", e)
             return False
 
-    def receive_data(self, size: int = 64) -> Optional[bytes]:
+    def receive_data(self, size: Optional[int] = None, copy: bool = False) -> Optional[Union[bytes, memoryview]]:
         """
         Receive data from the Android device via USB bulk transfer.
         
         Args:
-            size: Maximum number of bytes to read.
+            size: Maximum number of bytes to read. Defaults to read_chunk.
+            copy: Return an owned bytes copy instead of a view of the receive buffer.
             
         Returns:
-            Optional[bytes]: Received data as bytes, or None if an error or timeout occurs.
+            Optional[Union[bytes, memoryview]]: Received data, or None if an error or
+            timeout occurs. Without copy, this is a memoryview of the reusable receive
+            buffer and is only valid until the next receive_data() call.
         """
         if not self.connection or not self.endpoint_in:
             self.logger.error("USB connection or IN endpoint not ready for receiving data.")
             return None
 
+        if size is None:
+            size = self.read_chunk
+        # Reuse the preallocated buffer for default-sized reads
+        if self._rx_buffer is not None and size == len(self._rx_buffer):
+            buffer = self._rx_buffer
+        else:
+            buffer = array.array('B', bytes(size))
+
         try:
-            self.logger.info(f"Waiting to receive up to {size} bytes via USB...")
-            data = self.connection.bulkRead(
+            self.logger.info("Waiting to receive up to %d bytes via USB...", size)
+            length = self.device.read(
                 self.endpoint_in.bEndpointAddress,
-                size,
+                buffer,
                 self.operation_timeout # Timeout in milliseconds
             )
-            if data and len(data) > 0:
-                self.logger.info(f"Received {len(data)} bytes: {bytes(data)[:20]}...") # Log first 20 bytes
-                return bytes(data)
+            if length > 0:
+                data = memoryview(buffer)[:length]
+                if self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info("Received %d bytes: %r...", length, data[:20].tobytes()) # Log first 20 bytes
+                return data.tobytes() if copy else data
             else:
                 self.logger.warning("No data received (empty response or timeout).")
                 return None
         except usb.core.USBError as e:
-            self.logger.error(f"USB error during data receive: {e}")
+            self.logger.error("USB error during data receive: %s", e)
             if "timeout" in str(e).lower():
                 self.logger.warning("Receive operation timed out. No data from device.")
             return None
         except Exception as e:
-            self.logger.error(f"Unexpected error during data receive: {e}")
+            self.logger.error("Unexpected error during data receive: %s", e)
             return None
 
+    async def run_in_usb_thread(self, func, *args):
+        """
+        Run a blocking USB call on the manager's dedicated USB thread and await its result.
+        
+        pyusb only exposes synchronous transfers, so they are kept off the event loop
+        while other tasks (e.g. HTTP fetches) keep running.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._usb_executor, func, *args)
+
+    async def send_data_async(self, data: Union[bytes, bytearray, memoryview]) -> bool:
+        """
+        Send data to the Android device without blocking the event loop.
+        
+        Args:
+            data: Data to send (any bytes-like object).
+            
+        Returns:
+            bool: True if send was successful, False otherwise.
+        """
+        return await self.run_in_usb_thread(self.send_data, data)
+
+    async def receive_data_async(self, size: Optional[int] = None) -> Optional[bytes]:
+        """
+        Receive data from the Android device without blocking the event loop.
+        
+        The data is copied out of the receive buffer on the USB thread, since a
+        view of it could be overwritten by the next queued read before the
+        awaiting coroutine gets to use it.
+        
+        Args:
+            size: Maximum number of bytes to read. Defaults to read_chunk.
+            
+        Returns:
+            Optional[bytes]: Received data, or None if an error or timeout occurs.
+        """
+        return await self.run_in_usb_thread(self.receive_data, size, True)
+
     def close(self):
         """
         Close all USB connections and release resources.
@@ -284,6 +378,7 @@ class GoogleADKManager:
             self.interface = None
             self.endpoint_in = None
             self.endpoint_out = None
+            self._rx_buffer = None
             self.logger.info("ADK Manager resources cleaned up.")
         except Exception as e:
             self.logger.error(f"Error during ADK Manager cleanup: {e}") 
\ No newline at end of file
@@ -1,48 +1,103 @@
 from agents.planner_agent import PlannerAgent
 from core.agent_manager import AgentManager
-from dotenv import load_dotenv
+import asyncio
+import collections
+import functools
 import json
+import mmap
+import os
 import time
 import logging
+import logging.handlers
+import queue
 import sys
-from core.google_adk_manager import GoogleADKManager
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('app.log')
-    ]
-)
 
 logger = logging.getLogger(__name__)
+# User-facing console output, printed without the log record prefix
+user_logger = logging.getLogger("user")
 
-# Load environment variables
-load_dotenv()
+# orjson parses straight from a bytes buffer and is several times faster than json.
+# Its JSONDecodeError subclasses json.JSONDecodeError, so error handling is shared.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_loads(data):
+        return json.loads(bytes(data))
+
+class _ConsoleFormatter(logging.Formatter):
+    """Formats log records normally, but prints user logger messages as they are."""
+
+    def format(self, record):
+        if record.name == user_logger.name:
+            return record.getMessage()
+        return super().format(record)
+
+def _configure_logging():
+    """Configure logging once at startup. Logs go to stdout, and also to the file
+    named by APP_LOG_FILE when that variable is set.
+
+    Every record, including user-facing output, is queued and written by a single
+    background listener, so the console stays in order and concurrent work never
+    blocks on the terminal. The caller must stop() the returned listener to flush it.
+    """
+    log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(_ConsoleFormatter(log_format))
+    handlers = [console]
+    log_file = os.getenv("APP_LOG_FILE")
+    if log_file:
+        file_handler = logging.FileHandler(log_file)
+        file_handler.setFormatter(logging.Formatter(log_format))
+        # User-facing output repeats what is already logged
+        file_handler.addFilter(lambda record: record.name != user_logger.name)
+        handlers.append(file_handler)
+
+    records = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(records)
+    # Only merge the message and any traceback here; the listener's handlers add the prefix
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+
+    listener = logging.handlers.QueueListener(records, *handlers)
+    listener.start()
+    return listener
+
+@functools.lru_cache(maxsize=1)
+def _get_planner():
+    """Return the shared PlannerAgent; it keeps no per-goal state, so one instance serves every run."""
+    return PlannerAgent()
 
 # -------------------------
 # 🟢 Manual Goal Execution
 # -------------------------
-def run_manual():
+async def run_manual():
     """Run the system with a predefined goal."""
     try:
         user_goal = "Find the next SpaceX launch, check weather at that location, then summarize if it may be delayed."
         logger.info(f"Starting manual execution with goal: {user_goal}")
         
-        planner = PlannerAgent()
+        planner = _get_planner()
         task_plan = planner.plan(user_goal)
         logger.info(f"Planned tasks: {task_plan}")
 
         manager = AgentManager(task_plan)
-        final_result = manager.execute()
+        try:
+            final_result = await manager.aexecute()
+        finally:
+            await manager.aclose()
 
         logger.info("Execution completed successfully")
-        print("\n✅ Final Result:\n", final_result.get("delay_analysis", "No delay_analysis key found"))
+        analysis = final_result.get("delay_analysis")
+        if analysis:
+            delay_possible, condition = analysis
+            summary = f"Delay likely: {delay_possible} based on condition: {condition}"
+        else:
+            summary = "No delay_analysis key found"
+        user_logger.info(f"\n✅ Final Result:\n {summary}")
     except Exception as e:
         logger.error(f"Error in manual execution: {str(e)}", exc_info=True)
-        print(f"\n❌ Error: {str(e)}")
+        user_logger.info(f"\n❌ Error: {str(e)}")
 
 # -------------------------
 # 📱 ADK Device Execution
@@ -50,111 +105,182 @@ def run_manual():
 def run_adk_tasks():
     """Run ADK-specific tasks."""
     logger.info("Starting ADK device execution")
-    print("\n=== ADK Device Execution ===")
+    user_logger.info("\n=== ADK Device Execution ===")
     
     try:
         # Initialize planner and agent manager
-        planner = PlannerAgent()
+        planner = _get_planner()
         task_plan = planner.plan("Connect to Android device")
         agent_manager = AgentManager(task_plan)
         
-        # Connect to device
-        print("\n🔌 Connecting to device...")
-        result = agent_manager.execute()
-        if result.get("status") != "success":
+        # Connect, send test data and close in a single round trip. The batch stops
+        # at the first action that does not succeed, leaving recovery to us.
+        user_logger.info("\n🔌 Connecting to device and sending test data...")
+        result = agent_manager.execute(input_data={"batch": [
+            {"action": "connect"},
+            {"action": "send", "data": "Hello from ADK!"},
+            {"action": "close"}
+        ]})
+        results = result.get("results", [])
+        
+        if not results or results[0].get("status") != "success":
             logger.error("Failed to connect to device")
-            print("❌ Failed to connect to device")
+            user_logger.info("❌ Failed to connect to device")
             return
         logger.info("Successfully connected to device")
-        print("✅ Connected to device")
+        user_logger.info("✅ Connected to device")
         
-        # Send test data and receive response
-        print("\n📤 Sending test data...")
-        result = agent_manager.execute(input_data={
-            "action": "send",
-            "data": "Hello from ADK!"
-        })
-        
-        if result.get("status") == "success":
+        send_result = results[1]
+        if send_result.get("status") == "success":
             logger.info("Data sent successfully")
-            print("✅ Data sent successfully")
-            if "received_data" in result:
-                print(f"📥 Received response: {result['received_data']}")
-        elif result.get("status") == "warning":
+            user_logger.info("✅ Data sent successfully")
+            if "received_data" in send_result:
+                user_logger.info(f"📥 Received response: {send_result['received_data']}")
+        elif send_result.get("status") == "warning":
             logger.warning("Data sent but no response received")
-            print("⚠️ Data sent but no response received")
-            print("Trying to receive data separately...")
+            user_logger.info("⚠️ Data sent but no response received")
+            user_logger.info("Trying to receive data separately...")
             
             # Try to receive data separately
-            result = agent_manager.execute(input_data={"action": "receive"})
-            if result.get("status") == "success":
+            receive_result = agent_manager.execute(input_data={"action": "receive"})
+            if receive_result.get("status") == "success":
                 logger.info("Successfully received data")
-                print(f"📥 Received response: {result['data']}")
+                user_logger.info(f"📥 Received response: {receive_result['data']}")
             else:
                 logger.error("No response received")
-                print("❌ No response received")
+                user_logger.info("❌ No response received")
         else:
-            logger.error(f"Error sending data: {result.get('message')}")
-            print(f"❌ Error: {result.get('message')}")
+            logger.error(f"Error sending data: {send_result.get('message')}")
+            user_logger.info(f"❌ Error: {send_result.get('message')}")
         
-        # Close connection
-        print("\n🔌 Closing connection...")
-        result = agent_manager.execute(input_data={"action": "close"})
-        if result.get("status") == "success":
+        # Close connection, unless the batch already did
+        user_logger.info("\n🔌 Closing connection...")
+        if len(results) > 2:
+            close_result = results[2]
+        else:
+            close_result = agent_manager.execute(input_data={"action": "close"})
+        if close_result.get("status") == "success":
             logger.info("Connection closed successfully")
-            print("✅ Connection closed")
+            user_logger.info("✅ Connection closed")
         else:
-            logger.error(f"Error closing connection: {result.get('message')}")
-            print(f"❌ Error closing connection: {result.get('message')}")
+            logger.error(f"Error closing connection: {close_result.get('message')}")
+            user_logger.info(f"❌ Error closing connection: {close_result.get('message')}")
             
     except Exception as e:
         logger.error(f"Error in ADK execution: {str(e)}", exc_info=True)
-        print(f"\n❌ Error: {str(e)}")
+        user_logger.info(f"\n❌ Error: {str(e)}")
 
 # -------------------------
 # 🧪 Evaluation Runner
 # -------------------------
-def run_evaluations():
-    """Run evaluation test cases."""
+@functools.lru_cache(maxsize=8)
+def _load_evals(path, mtime):
+    """Parse a test case file. Cached per (path, mtime), so an unchanged file is
+    only parsed once per process; callers must not mutate the returned cases.
+
+    Each case gets an "_expected" frozenset of its expected_keys for the result check."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return _json_loads(b"")
+        # Map the file instead of reading it into an intermediate str
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                evals = _json_loads(view)
+
+    for case in evals:
+        case["_expected"] = frozenset(case["expected_keys"])
+    return evals
+
+# Upper bound on evaluations in flight, to stay within the public APIs' rate limits
+EVAL_CONCURRENCY = 4
+
+async def _eval_goal(goal, managers):
+    """Plan and execute a single evaluation goal on a manager borrowed from the
+    pool, returning its plan and result."""
+    agent_manager = await managers.get()
+    try:
+        logger.info(f"Evaluating goal: {goal}")
+        planner = _get_planner()
+        task_order = planner.plan(goal)
+
+        agent_manager.set_plan(task_order)
+        result = await agent_manager.aexecute()
+        return task_order, result
+    finally:
+        managers.put_nowait(agent_manager)
+
+async def run_evaluations():
+    """Run evaluation test cases concurrently."""
     try:
         logger.info("Starting evaluation run")
-        with open("evals/test_cases.json", "r") as f:
-            evals = json.load(f)
+        path = "evals/test_cases.json"
+        evals = _load_evals(path, os.path.getmtime(path))
 
+        # Goals with the same normalized form get the same plan, and the result only
+        # depends on the plan, so each group is planned and executed once
+        groups = collections.defaultdict(list)
         for case in evals:
-            logger.info(f"Evaluating goal: {case['goal']}")
-            print(f"\n🔍 Evaluating goal: {case['goal']}")
+            groups[PlannerAgent.normalize_goal(case["goal"])].append(case)
+        planner_calls_saved = len(evals) - len(groups)
+        logger.info(f"Evaluating {len(evals)} cases with {len(groups)} unique goals (planner_calls_saved={planner_calls_saved})")
+
+        # A manager holds the state of the run in progress, so each evaluation in flight
+        # borrows its own from a fixed pool and they are reused instead of rebuilt per goal
+        managers = asyncio.Queue()
+        for _ in range(min(EVAL_CONCURRENCY, len(groups))):
+            managers.put_nowait(AgentManager([]))
+        try:
+            outcomes = await asyncio.gather(
+                *(_eval_goal(cases[0]["goal"], managers) for cases in groups.values()),
+                return_exceptions=True
+            )
+        finally:
+            # All cases share the event loop's HTTP session; release it once they are done
+            await AgentManager.aclose()
+        outcomes_by_goal = dict(zip(groups, outcomes))
 
-            planner = PlannerAgent()
-            task_order = planner.plan(case["goal"])
-            print(f"Planned tasks: {task_order}")
+        # Report in test case order once everything has finished
+        for case in evals:
+            outcome = outcomes_by_goal[PlannerAgent.normalize_goal(case["goal"])]
+            user_logger.info(f"\n🔍 Evaluating goal: {case['goal']}")
+            if isinstance(outcome, Exception):
+                logger.error(f"Error evaluating goal '{case['goal']}': {str(outcome)}")
+                user_logger.info(f"❌ Error: {str(outcome)}")
+                continue
 
-            agent_manager = AgentManager(task_order)
-            result = agent_manager.execute()
+            task_order, result = outcome
+            user_logger.info(f"Planned tasks: {task_order}")
 
-            missing = [k for k in case["expected_keys"] if k not in result]
+            missing = case["_expected"] - result.keys()
             if not missing:
                 logger.info("Evaluation passed")
-                print("✅ Eval Passed")
+                user_logger.info("✅ Eval Passed")
             else:
+                missing = sorted(missing)
                 logger.warning(f"Evaluation failed. Missing keys: {missing}")
-                print(f"❌ Eval Failed. Missing keys: {missing}")
+                user_logger.info(f"❌ Eval Failed. Missing keys: {missing}")
                 
     except FileNotFoundError:
         logger.error("Test cases file not found")
-        print("❌ Error: Test cases file not found")
+        user_logger.info("❌ Error: Test cases file not found")
     except json.JSONDecodeError:
         logger.error("Invalid JSON in test cases file")
-        print("❌ Error: Invalid JSON in test cases file")
+        user_logger.info("❌ Error: Invalid JSON in test cases file")
     except Exception as e:
         logger.error(f"Error in evaluation: {str(e)}", exc_info=True)
-        print(f"\n❌ Error: {str(e)}")
+        user_logger.info(f"\n❌ Error: {str(e)}")
 
 # -------------------------
 # 🏁 Entry Point
 # -------------------------
 def main():
     """Main entry point for the application."""
+    from dotenv import load_dotenv
+
+    # Load environment variables
+    load_dotenv()
+    log_listener = _configure_logging()
+
     try:
         print("\nChoose mode:")
         print("1: Manual")
@@ -163,21 +289,24 @@ def main():
         choice = input("Enter your choice (1-3): ")
 
         if choice == "1":
-            run_manual()
+            asyncio.run(run_manual())
         elif choice == "2":
             run_adk_tasks()
         elif choice == "3":
-            run_evaluations()
+            asyncio.run(run_evaluations())
         else:
             logger.warning(f"Invalid choice: {choice}")
-            print("Invalid choice!")
+            user_logger.info("Invalid choice!")
             
     except KeyboardInterrupt:
         logger.info("Program interrupted by user")
-        print("\nProgram interrupted by user")
+        user_logger.info("\nProgram interrupted by user")
     except Exception as e:
         logger.error(f"Unexpected error: {str(e)}", exc_info=True)
-        print(f"\n❌ Unexpected error: {str(e)}")
+        user_logger.info(f"\n❌ Unexpected error: {str(e)}")
+    finally:
+        # Write any queued messages before exiting
+        log_listener.stop()
 
 if __name__ == "__main__":
     main()